@@ -12,6 +12,8 @@ class GameElement(ABC):
     be displayed on the game's screen
     """
 
+    __slots__ = ("__game", "__x", "__y")
+
     def __init__(self, game: "Game"):
         self.__game: "Game" = game
         self.__x: float = 0
@@ -90,6 +92,8 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         self.__canvas.pack(expand=True, fill="both")
         self.pack(expand=True, fill="both")
         self.__game_elements = []
+        self.__canvas_path = str(self.__canvas)
+        self.__pending_commands = []
         self.__update_delay = update_delay
         self.__started = False
         self.init_game()
@@ -112,6 +116,13 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         Get called when the player loses the game
         """
 
+    def post_update(self) -> None:
+        """
+        Get called once per frame after all game elements are updated and
+        rendered, before the queued canvas changes are applied. It does
+        nothing by default.
+        """
+
     def add_element(self, element: GameElement) -> None:
         """
         Add a GameElement object to the game
@@ -126,6 +137,43 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         element.delete()
         self.__game_elements.remove(element)
 
+    def queue_coords(self, item: int,
+                     x1: float, y1: float, x2: float, y2: float) -> None:
+        """
+        Queue new coordinates of a canvas item to be applied by the next call
+        to flush_render()
+        """
+        self.__pending_commands.append(
+            f"{self.__canvas_path} coords {item} "
+            f"{int(x1)} {int(y1)} {int(x2)} {int(y2)}")
+
+    def queue_move(self, item: int, dx: int, dy: int) -> None:
+        """
+        Queue moving a canvas item by (dx, dy) whole pixels to be applied by
+        the next call to flush_render()
+        """
+        self.__pending_commands.append(
+            f"{self.__canvas_path} move {item} {dx} {dy}")
+
+    def queue_state(self, item: int, state: str) -> None:
+        """
+        Queue changing the state ("normal" or "hidden") of a canvas item to be
+        applied by the next call to flush_render()
+        """
+        self.__pending_commands.append(
+            f"{self.__canvas_path} itemconfigure {item} -state {state}")
+
+    def flush_render(self) -> None:
+        """
+        Apply all queued canvas changes using a single Tcl script, which is
+        much cheaper than calling the canvas methods for each item
+        """
+        if not self.__pending_commands:
+            return
+        script = "\n".join(self.__pending_commands)
+        self.__pending_commands.clear()
+        self.__canvas.tk.eval(script)
+
     @property
     def canvas(self) -> tk.Canvas:
         """
@@ -161,5 +209,8 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         for element in self.__game_elements:
             element.update()
             element.render()
+        self.post_update()
+        self.flush_render()
+        self.update_idletasks()
         if self.__started:
             self.after(self.__update_delay, self.animate)
@@ -2,12 +2,22 @@
 The turtle_adventure module maintains all classes related to the Turtle's
 adventure game.
 """
+from abc import abstractmethod
 from turtle import RawTurtle
+from typing import Final, Optional
 from gamelib import Game, GameElement
 import random
 import time
 import math
 
+# maximum number of enemies alive at the same time
+MAX_ENEMIES: Final = 300
+# interval in milliseconds at which EnemyGenerator checks its spawning jobs
+SPAWN_TICK_MS: Final = 100
+# moves of AroundHomeEnemy on each side of its square, walked 34 steps per
+# side: right, down, left, then up
+AROUND_HOME_MOVES: Final = ((3, 0), (0, 3), (-3, 0), (0, -3))
+
 
 class TurtleGameElement(GameElement):
     """
@@ -15,6 +25,8 @@ class TurtleGameElement(GameElement):
     Adventure game
     """
 
+    __slots__ = ("__game",)
+
     def __init__(self, game: "TurtleAdventureGame"):
         super().__init__(game)
         self.__game: "TurtleAdventureGame" = game
@@ -146,6 +158,8 @@ class Player(TurtleGameElement):
         super().__init__(game)
         self.__speed: float = speed
         self.__turtle: RawTurtle = turtle
+        self.__drawn_pose: Optional[tuple[float, float, float]] = None
+        self.__facing: Optional[tuple[float, float]] = None
 
     def create(self) -> None:
         turtle = RawTurtle(self.canvas)
@@ -171,20 +185,42 @@ class Player(TurtleGameElement):
         pass
 
     def update(self) -> None:
+        turtle = self.__turtle
+        # read the turtle's position once instead of through the x/y
+        # properties
+        x = turtle.xcor()
+        y = turtle.ycor()
         # check if player has arrived home
-        if self.game.home.contains(self.x, self.y):
+        if self.game.home.contains(x, y):
             self.game.game_over_win()
-        turtle = self.__turtle
         waypoint = self.game.waypoint
-        if self.game.waypoint.is_active:
-            turtle.setheading(turtle.towards(waypoint.x, waypoint.y))
-            turtle.forward(self.speed)
-            if turtle.distance(waypoint.x, waypoint.y) < self.speed:
+        if waypoint.is_active:
+            wx = waypoint.x
+            wy = waypoint.y
+            speed = self.__speed
+            # the direction only changes with the waypoint, so turn the
+            # turtle once per waypoint instead of every frame
+            if (wx, wy) != self.__facing:
+                self.__facing = (wx, wy)
+                turtle.setheading(turtle.towards(wx, wy))
+            dx = wx - x
+            dy = wy - y
+            d2 = dx*dx + dy*dy
+            if d2 <= speed*speed:
+                turtle.goto(wx, wy)
                 waypoint.deactivate()
+            else:
+                scale = speed/math.sqrt(d2)
+                turtle.goto(x + dx*scale, y + dy*scale)
 
     def render(self) -> None:
-        self.__turtle.goto(self.x, self.y)
-        self.__turtle.getscreen().update()
+        turtle = self.__turtle
+        pose = (turtle.xcor(), turtle.ycor(), turtle.heading())
+        # redraw the turtle only when it has moved or turned; other canvas
+        # changes are flushed once per frame by Game.animate()
+        if pose != self.__drawn_pose:
+            self.__drawn_pose = pose
+            turtle.getscreen().update()
 
     # override original property x's getter/setter to use turtle's methods
     # instead
@@ -212,6 +248,9 @@ class Enemy(TurtleGameElement):
     Define an abstract enemy for the Turtle's adventure game
     """
 
+    __slots__ = ("__size", "__color", "__id", "__last_x", "__last_y",
+                 "__visible")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
@@ -219,6 +258,11 @@ class Enemy(TurtleGameElement):
         super().__init__(game)
         self.__size = size
         self.__color = color
+        self.__id: Optional[int] = None
+        self.__last_x: Optional[int] = None
+        self.__last_y: Optional[int] = None
+        # the canvas item starts hidden and is shown by the first render
+        self.__visible: bool = False
 
     @property
     def size(self) -> float:
@@ -234,15 +278,66 @@ class Enemy(TurtleGameElement):
         """
         return self.__color
 
-    def hits_player(self):
+    @property
+    def tags(self) -> tuple[str, str]:
+        """
+        Get the canvas tags of the enemy: "enemy" and its lowercase class name
+        """
+        return ("enemy", type(self).__name__.lower())
+
+    @property
+    def item(self) -> Optional[int]:
         """
-        Check whether the enemy is hitting the player
+        Get or set the id of the canvas item representing the enemy
         """
-        return (
-            (self.x - self.size/2 < self.game.player.x < self.x + self.size/2)
-            and
-            (self.y - self.size/2 < self.game.player.y < self.y + self.size/2)
-        )
+        return self.__id
+
+    @item.setter
+    def item(self, val: Optional[int]) -> None:
+        self.__id = val
+
+    def update(self) -> None:
+        # enemies are not registered as game elements; they are stepped and
+        # rendered by TurtleAdventureGame.step_enemies() instead
+        pass
+
+    @abstractmethod
+    def step(self, px: float, py: float) -> None:
+        """
+        Move the enemy by one frame, given the player's position (px, py)
+        """
+
+    def render(self) -> None:
+        # changes are queued and sent to Tk in one batch by the game; this is
+        # the only place where the position is converted to whole pixels, so
+        # the offsets below are already ints
+        x = int(self.x)
+        y = int(self.y)
+        half = self.size/2
+        # skip enemies that are entirely outside the screen, hiding them once
+        if not (-half < x < self.game.screen_width + half
+                and -half < y < self.game.screen_height + half):
+            if self.__visible:
+                self.__visible = False
+                self.game.queue_state(self.__id, "hidden")
+            return
+        if not self.__visible:
+            self.__visible = True
+            self.game.queue_state(self.__id, "normal")
+        if self.__last_x is None:
+            self.game.queue_coords(self.__id,
+                                   x - half, y - half, x + half, y + half)
+        else:
+            # the size never changes, so moving the item is enough
+            dx = x - self.__last_x
+            dy = y - self.__last_y
+            if dx or dy:
+                self.game.queue_move(self.__id, dx, dy)
+        self.__last_x = x
+        self.__last_y = y
+
+    def delete(self) -> None:
+        self.game.release_item(self.__id)
 
 
 # Random walking Enemy walk randomly
@@ -258,203 +353,119 @@ class ShakingEnemy(Enemy):
     Random movement and has acceleration
     """
 
+    __slots__ = ("speed",)
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 2.5
 
     def create(self):
-        self.__id = self.canvas.create_oval(0,0,0,0, fill = self.color)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         self.speed += 0.01
-        if self.x >= 0 and self.x <= 800:
-            if self.y>= 0 and self.y<=500:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y - self.speed),math.ceil(self.y + self.speed))
-            elif self.y<=0:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y),math.ceil(self.y + self.speed))       
-            else:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y-self.speed),math.ceil(self.y))
-        elif self.x <=0:
-            if self.y>= 0 and self.y<=500:
-                self.x = random.randint(math.floor(self.x), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y - self.speed),math.ceil(self.y + self.speed))
-            elif self.y<=0:
-                self.x = random.randint(math.floor(self.x), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y),math.ceil(self.y + self.speed))       
-            else:
-                self.x = random.randint(math.floor(self.x), math.ceil(self.x + self.speed))
-                self.y = random.randint(math.floor(self.y-self.speed),math.ceil(self.y))
-        else:
-            if self.y>= 0 and self.y<=500:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x))
-                self.y = random.randint(math.floor(self.y - self.speed),math.ceil(self.y + self.speed))
-            elif self.y<=0:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x))
-                self.y = random.randint(math.floor(self.y),math.ceil(self.y + self.speed))       
-            else:
-                self.x = random.randint(math.floor(self.x - self.speed), math.ceil(self.x))
-                self.y = random.randint(math.floor(self.y-self.speed),math.ceil(self.y))
-        if self.hits_player():
-            self.game.game_over_lose()
-
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
+        _r = random.random
+        speed = self.speed
+        # pick a random point within speed distance, clamped to the screen
+        lo_x = max(0.0, self.x - speed)
+        hi_x = min(800.0, self.x + speed)
+        lo_y = max(0.0, self.y - speed)
+        hi_y = min(500.0, self.y + speed)
+        self.x = lo_x + (hi_x - lo_x)*_r()
+        self.y = lo_y + (hi_y - lo_y)*_r()
 
-    def delete(self):
-        pass
 
 class PursuitEnemy(Enemy):
     """
     Chasing player
     """
 
+    __slots__ = ("speed",)
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 1
 
     def create(self):
-        self.__id = self.canvas.create_oval(0,0,0,0, fill = self.color)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         self.speed += 0.01
-        if self.x > self.game.player.x:
-            self.x -= math.floor(self.speed)
-        elif self.x == self.game.player.x:
-            pass
-        else:
-            self.x += math.floor(self.speed)
-        if self.y > self.game.player.y:
-            self.y -= math.floor(self.speed)
-        elif self.y == self.game.player.y:
-            pass
-        else:
-            self.y += math.floor(self.speed)
-        if self.hits_player():
-            self.game.game_over_lose()
+        sp = math.floor(self.speed)
+        x = self.x
+        y = self.y
+        # step towards the player, or stay put on an axis already aligned
+        self.x = x + (sp if px > x else -sp)*(px != x)
+        self.y = y + (sp if py > y else -sp)*(py != y)
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
 
 class AroundHomeEnemy(Enemy):
     """
     Camp around the home
     """
 
+    __slots__ = ("__steps",)
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.x = self.game.home.x - 50
         self.y = self.game.home.y - 50
-        self.move_x = 0
-        self.move_y = 0
-        self.moving_x = True
-        self.moving_y = False
-        self.move_left = True
-        self.move_up = True
+        # number of steps taken so far, which determines the side of the
+        # square being walked
+        self.__steps = 0
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(self.x,self.y,self.x+self.size,self.y+self.size, fill = self.color)
-
-    def update(self):
-        if self.moving_x:
-            if self.move_left == False:
-                self.x += 3
-                self.move_x += 3
-                if self.move_x >= 100:
-                    self.moving_x = False
-                    self.moving_y = True
-                    self.move_left = True
-            else:
-                self.x -= 3
-                self.move_x -= 3
-                if self.move_x <= 0:
-                    self.moving_x = False
-                    self.moving_y = True
-                    self.move_left = False
-        else:
-            if self.move_up == False:
-                self.y += 3
-                self.move_y += 3
-                if self.move_y >= 100:
-                    self.moving_y = False
-                    self.moving_x = True
-                    self.move_up = True
-            else:
-                self.y -= 3
-                self.move_y -= 3
-                if self.move_y <= 0:
-                    self.moving_y = False
-                    self.moving_x = True    
-                    self.move_up = False        
-        if self.hits_player():
-            self.game.game_over_lose()
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
+    def step(self, px, py):
+        dx, dy = AROUND_HOME_MOVES[(self.__steps // 34) & 3]
+        self.x += dx
+        self.y += dy
+        self.__steps += 1
 
-    def delete(self):
-        pass
 
 class SummonEnemy(Enemy):
     """
     Create a summoner that create scatter shot of minions around it
     """
 
+    __slots__ = ("speed",)
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 1
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(0,0,0,0, fill = self.color)
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
 
-    def update(self):
-        if self.x >= self.game.player.x:
-            self.x -= math.floor(self.speed)
-        elif self.x == self.game.player.x:
-            pass
-        else:
-            self.x += math.floor(self.speed)
-        if self.y >= self.game.player.y:
-            self.y -= math.floor(self.speed)
-        elif self.y == self.game.player.y:
-            pass
-        else:
-            self.y += math.floor(self.speed)
-        if self.hits_player():
-            self.game.game_over_lose()
+    def step(self, px, py):
+        sp = math.floor(self.speed)
+        x = self.x
+        y = self.y
+        # step towards the player, or stay put on an axis already aligned
+        self.x = x + (sp if px > x else -sp)*(px != x)
+        self.y = y + (sp if py > y else -sp)*(py != y)
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
 
 class DiagonalMinionEnemy(Enemy):
     """
     Minion of the summoner
     """
 
+    __slots__ = ("summoner", "__sx", "__sy", "__vx", "__vy")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
@@ -462,47 +473,48 @@ class DiagonalMinionEnemy(Enemy):
                  summoner: SummonEnemy
                  ):
         super().__init__(game, size, color)
-        self.__id = None
-        self.speed = 2
         self.summoner = summoner
-        self.choosing1 = random.choice(["Up","Down"])
-        self.choosing2 = random.choice(["Right","Left"])
+        # direction signs of the diagonal acceleration on each axis
+        self.__sx = 1 if random.random() < 0.5 else -1
+        self.__sy = 1 if random.random() < 0.5 else -1
+        # velocity on each axis, starting at speed 2
+        self.__vx = 2*self.__sx
+        self.__vy = 2*self.__sy
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
-
-    def update(self):
-        self.speed += 0.4
-        if self.choosing1 == "Up":
-            self.y += self.speed
-        else:
-            self.y -= self.speed
-        if self.choosing2 == "Right":
-            self.x += self.speed
-        else:
-            self.x -= self.speed
-        if self.hits_player():
-            self.game.game_over_lose()
-        if self.x >= 800:
-            self.speed = self.speed*-1
-        elif self.x <= 0:
-            self.speed = self.speed*-1
-        if self.y >= 500:
-            self.speed = self.speed*-1
-        elif self.y <= 0:
-            self.speed = self.speed*-1
-
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
+
+    def step(self, px, py):
+        vx = self.__vx + 0.4*self.__sx
+        vy = self.__vy + 0.4*self.__sy
+        x = self.x + vx
+        y = self.y + vy
+        # bounce off a wall by reversing only the velocity across it
+        if x >= 800:
+            x = 800
+            vx = -abs(vx)
+        elif x <= 0:
+            x = 0
+            vx = abs(vx)
+        if y >= 500:
+            y = 500
+            vy = -abs(vy)
+        elif y <= 0:
+            y = 0
+            vy = abs(vy)
+        self.__vx = vx
+        self.__vy = vy
+        self.x = x
+        self.y = y
 
-    def delete(self):
-        pass
 
 class StraightMinionEnemy(Enemy):
     """
     Minion of the summoner
     """
 
+    __slots__ = ("speed", "summoner", "__sx", "__sy")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
@@ -510,98 +522,77 @@ class StraightMinionEnemy(Enemy):
                  summoner: SummonEnemy
                  ):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 2
         self.summoner = summoner
-        self.choosing = random.choice(["Up","Down","Right","Left"])
+        # direction signs of the straight movement, only one is nonzero
+        self.__sx, self.__sy = random.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         self.speed += 0.4
-        if self.choosing == "Right":
-            self.x += math.floor(self.speed)
-        elif self.choosing == "Left":
-            self.x -= math.floor(self.speed)
-        elif self.choosing == "Up":
-            self.y += math.floor(self.speed)
-        else:
-            self.y -= math.floor(self.speed)
-        if self.hits_player():
-            self.game.game_over_lose()
-        if self.x >= 800:
+        sp = math.floor(self.speed)
+        x = self.x + self.__sx*sp
+        y = self.y + self.__sy*sp
+        self.x = x
+        self.y = y
+        if x >= 800:
             self.speed = self.speed*-1
-        elif self.x <= 0:
+        elif x <= 0:
             self.speed = self.speed*-1
-        if self.y >= 500:
+        if y >= 500:
             self.speed = self.speed*-1
-        elif self.y <= 0:
+        elif y <= 0:
             self.speed = self.speed*-1
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
 
 class BossEnemy(Enemy):
     """
     Create scatter shot summoners that create scatter shot of minions around it
     """
 
+    __slots__ = ("speed",)
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 1
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(0,0,0,0, fill = self.color)
-
-    def update(self):
-        if self.x >= self.game.player.x:
-            self.x -= math.floor(self.speed)
-        elif self.x == self.game.player.x:
-            pass
-        else:
-            self.x += math.floor(self.speed)
-        if self.y >= self.game.player.y:
-            self.y -= math.floor(self.speed)
-        elif self.y == self.game.player.y:
-            pass
-        else:
-            self.y += math.floor(self.speed)
-        if self.hits_player():
-            self.game.game_over_lose()
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
+    def step(self, px, py):
+        sp = math.floor(self.speed)
+        x = self.x
+        y = self.y
+        # step towards the player, or stay put on an axis already aligned
+        self.x = x + (sp if px > x else -sp)*(px != x)
+        self.y = y + (sp if py > y else -sp)*(py != y)
 
-    def delete(self):
-        pass
 
 class Trapper1Enemy(Enemy):
     """
     Create traps along its path
     """
 
+    __slots__ = ("speed", "choosing")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str,
                  ):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = math.ceil(self.game.level/2)
         self.choosing = random.choice(["Up","Down","Right","Left"])
 
     def create(self):
-        self.__id = self.canvas.create_oval(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         if self.choosing == "Right":
             self.x += math.floor(self.speed)
         elif self.choosing == "Left":
@@ -610,8 +601,6 @@ class Trapper1Enemy(Enemy):
             self.y += math.floor(self.speed)
         else:
             self.y -= math.floor(self.speed)
-        if self.hits_player():
-            self.game.game_over_lose()
         if self.x >= 800:
             self.speed = self.speed*-1
         elif self.x <= 0:
@@ -621,32 +610,28 @@ class Trapper1Enemy(Enemy):
         elif self.y <= 0:
             self.speed = self.speed*-1
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
 
 class Trapper2Enemy(Enemy):
     """
     Create traps along its path
     """
 
+    __slots__ = ("speed", "choosing1", "choosing2")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str,
                  ):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = math.ceil(self.game.level/2)
         self.choosing1 = random.choice(["Up","Down"])
         self.choosing2 = random.choice(["Right","Left"])
 
     def create(self):
-        self.__id = self.canvas.create_oval(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         if self.choosing1 == "Up":
             self.y += self.speed
         else:
@@ -655,8 +640,6 @@ class Trapper2Enemy(Enemy):
             self.x += self.speed
         else:
             self.x -= self.speed
-        if self.hits_player():
-            self.game.game_over_lose()
         if self.x >= 800:
             self.speed = self.speed*-1
         elif self.x <= 0:
@@ -666,79 +649,67 @@ class Trapper2Enemy(Enemy):
         elif self.y <= 0:
             self.speed = self.speed*-1
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
 
 class TrapEnemy(Enemy):
     """
     It is a trap!
     """
 
+    __slots__ = ("speed", "choosing")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str,
                  ):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 2
         self.choosing = random.choice(["Up","Down","Right","Left"])
 
     def create(self):
-        self.__id = self.canvas.create_rectangle(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
+        self.item = self.game.acquire_item("rectangle", self.color, self.tags)
 
-    def update(self):
-        if self.hits_player():
-            self.game.game_over_lose()
+    def step(self, px, py):
+        # stays still
+        pass
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
 
-    def delete(self):
-        pass
-    
 class OrbitalEnemy(Enemy):
     """
     Have object orbit around but stand still
     """
 
+    __slots__ = ("speed", "choosing")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str,
                  ):
         super().__init__(game, size, color)
-        self.__id = None
         self.speed = 2
         self.choosing = random.choice(["Up","Down","Right","Left"])
 
     def create(self):
-        self.__id = self.canvas.create_oval(self.x-self.size/2,self.y-self.size/2,self.x+self.size/2,self.y+self.size/2, fill = self.color)
-
-    def update(self):
-        if self.hits_player():
-            self.game.game_over_lose()
-
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def delete(self):
+    def step(self, px, py):
+        # stays still
         pass
 
+
 class OrbittingEnemy(Enemy):
     """
     Enemy that will orbit around orbital enemy
     """
 
+    __slots__ = ("move_x", "move_y", "moving_x", "moving_y", "move_left", "move_up")
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str):
         super().__init__(game, size, color)
-        self.__id = None
         self.move_x = 0
         self.move_y = 0
         self.moving_x = True
@@ -747,9 +718,9 @@ class OrbittingEnemy(Enemy):
         self.move_up = True
 
     def create(self):
-        self.__id = self.canvas.create_oval(self.x,self.y,self.x+self.size,self.y+self.size, fill = self.color)
+        self.item = self.game.acquire_item("oval", self.color, self.tags)
 
-    def update(self):
+    def step(self, px, py):
         if self.moving_x:
             if self.move_left == False:
                 self.x += 5
@@ -780,14 +751,7 @@ class OrbittingEnemy(Enemy):
                     self.moving_y = False
                     self.moving_x = True    
                     self.move_up = False        
-        if self.hits_player():
-            self.game.game_over_lose()
 
-    def render(self):
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y-self.size/2, self.x+self.size/2, self.y+self.size/2)
-
-    def delete(self):
-        pass
     
 class EnemyGenerator:
     """
@@ -798,9 +762,14 @@ class EnemyGenerator:
     def __init__(self, game: "TurtleAdventureGame", level: int):
         self.__game: TurtleAdventureGame = game
         self.__level: int = level
+        # spawning jobs as [due time in ms, period in ms, function, args],
+        # where a cancelled job has its function set to None;
+        # they all run from a single after() loop instead of each keeping its
+        # own chain of after() callbacks
+        self.__jobs: list[list] = []
 
-        # example
-        self.__game.after(100, self.create_enemy)
+        self.schedule(100, math.ceil((10000/self.level)+2000), self.create_enemy)
+        self.__game.after(SPAWN_TICK_MS, self.__tick)
 
     @property
     def game(self) -> "TurtleAdventureGame":
@@ -816,6 +785,36 @@ class EnemyGenerator:
         """
         return self.__level
 
+    def schedule(self, delay: int, period: int, func, *args) -> None:
+        """
+        Call func(*args) after delay milliseconds and then every period
+        milliseconds
+        """
+        self.__jobs.append([time.monotonic()*1000 + delay, period, func, args])
+
+    def cancel(self, spawner: Enemy) -> None:
+        """
+        Drop all jobs spawning enemies from the given enemy
+        """
+        # this may run from a job while __tick() goes through the jobs, so
+        # the jobs are only marked dead here and dropped by __tick()
+        for job in self.__jobs:
+            if spawner in job[3]:
+                job[2] = None
+
+    def __tick(self) -> None:
+        # nothing spawns while the game is not running, but the tick keeps
+        # going since it is already scheduled before the game starts
+        if self.__game.is_started:
+            now = time.monotonic()*1000
+            for job in self.__jobs:
+                due, period, func, args = job
+                if func is not None and due <= now:
+                    job[0] = now + period
+                    func(*args)
+            self.__jobs[:] = [job for job in self.__jobs if job[2] is not None]
+        self.__game.after(SPAWN_TICK_MS, self.__tick)
+
     def create_enemy(self):
         """
         Create a new enemy, possibly based on the game level
@@ -823,77 +822,82 @@ class EnemyGenerator:
         new_enemy_r = ShakingEnemy(self.__game, 20, "red")
         new_enemy_r.x = random.randint(200,800)
         new_enemy_r.y = random.randint(0,400)
-        self.game.add_element(new_enemy_r)
+        self.game.add_enemy(new_enemy_r)
         new_enemy_p = PursuitEnemy(self.__game, 10, "yellow")
         new_enemy_p.x = random.randint(200,800)
         new_enemy_p.y = random.randint(0,400)
-        self.game.add_element(new_enemy_p)
+        self.game.add_enemy(new_enemy_p)
         new_enemy_a = AroundHomeEnemy(self.__game, 25, "blue")
         new_enemy_a.x = self.__game.home.x - 50
         new_enemy_a.y = self.__game.home.y - 50
-        self.game.add_element(new_enemy_a)            
+        self.game.add_enemy(new_enemy_a)            
         new_enemy_s = SummonEnemy(self.__game, 30, "green")
         new_enemy_s.x = random.randint(200,800)
         new_enemy_s.y = random.randint(0,400)
-        self.game.add_element(new_enemy_s)
+        self.game.add_enemy(new_enemy_s)
         new_enemy_b = BossEnemy(self.__game, 30, "orange")
         new_enemy_b.x = random.randint(200,800)
         new_enemy_b.y = random.randint(0,400)
-        self.game.add_element(new_enemy_b)
+        self.game.add_enemy(new_enemy_b)
         new_enemy_t1 = Trapper1Enemy(self.__game, 30, "magenta")
         new_enemy_t1.x = random.randint(200,800)
         new_enemy_t1.y = random.randint(0,400)
-        self.game.add_element(new_enemy_t1)
+        self.game.add_enemy(new_enemy_t1)
         new_enemy_t2 = Trapper2Enemy(self.__game, 30, "gold")
         new_enemy_t2.x = random.randint(200,800)
         new_enemy_t2.y = random.randint(0,400)
         new_enemy_o = OrbitalEnemy(self.__game, 25, "indigo")
         new_enemy_o.x = random.randint(200,800)
         new_enemy_o.y = random.randint(0,400)
-        self.game.add_element(new_enemy_t2)
-        self.game.add_element(new_enemy_o)
-        for i in range(3):
-            self.create_summon(new_enemy_s)
-        for i in range(3):
-            self.create_boss(new_enemy_b)
-        self.create_trapper(new_enemy_t1)        
-        self.create_trapper(new_enemy_t2)        
-        self.create_orbital(new_enemy_o)        
-        self.__game.after(math.ceil((10000/self.level)+2000), self.create_enemy)
-
-    def create_summon(self,summoner):
-        new_enemy_dm = DiagonalMinionEnemy(self.__game, 10, "pink", summoner)
-        new_enemy_dm.x = random.randint(summoner.x-10,summoner.x+10)
-        new_enemy_dm.y = random.randint(summoner.y-10,summoner.y+10)
-        self.game.add_element(new_enemy_dm)
+        self.game.add_enemy(new_enemy_t2)
+        self.game.add_enemy(new_enemy_o)
+        minion_period = math.ceil(10000/self.level)+500
+        trap_period = math.ceil(10000/self.level)+200
+        orbit_period = math.ceil(5000/self.level)+200
+        self.create_summon(new_enemy_s, 3)
+        self.schedule(minion_period, minion_period, self.create_summon, new_enemy_s, 3)
+        self.create_boss(new_enemy_b, 3)
+        self.schedule(minion_period, minion_period, self.create_boss, new_enemy_b, 3)
+        for trapper in (new_enemy_t1, new_enemy_t2):
+            self.create_trapper(trapper)
+            self.schedule(trap_period, trap_period, self.create_trapper, trapper)
+        self.create_orbital(new_enemy_o)
+        self.schedule(orbit_period, orbit_period, self.create_orbital, new_enemy_o)
+
+    def create_summon(self, summoner, count=1):
+        # sample the offsets of all minions with a single call
+        offsets = random.choices(range(-10, 11), k=2*count)
+        for dx, dy in zip(offsets[::2], offsets[1::2]):
+            new_enemy_dm = DiagonalMinionEnemy(self.__game, 10, "pink", summoner)
+            new_enemy_dm.x = summoner.x + dx
+            new_enemy_dm.y = summoner.y + dy
+            self.game.add_enemy(new_enemy_dm)
         # new_enemy_sm = StraightMinionEnemy(self.__game, 20, "pink", summoner)
         # new_enemy_sm.x = random.randint(x-10,x+10)
         # new_enemy_sm.y = random.randint(y-10,y+10)
-        # self.game.add_element(new_enemy_sm)
-        self.__game.after(math.ceil(10000/self.level)+500, lambda: self.create_summon(summoner))
+        # self.game.add_enemy(new_enemy_sm)
     
-    def create_boss(self,boss):
-        new_enemy_sm = StraightMinionEnemy(self.__game, 10, "linen", boss)
-        new_enemy_sm.x = random.randint(boss.x-10,boss.x+10)
-        new_enemy_sm.y = random.randint(boss.y-10,boss.y+10)
-        self.game.add_element(new_enemy_sm)
-        self.__game.after(math.ceil(10000/self.level)+500, lambda: self.create_boss(boss))
+    def create_boss(self, boss, count=1):
+        # sample the offsets of all minions with a single call
+        offsets = random.choices(range(-10, 11), k=2*count)
+        for dx, dy in zip(offsets[::2], offsets[1::2]):
+            new_enemy_sm = StraightMinionEnemy(self.__game, 10, "linen", boss)
+            new_enemy_sm.x = boss.x + dx
+            new_enemy_sm.y = boss.y + dy
+            self.game.add_enemy(new_enemy_sm)
 
     def create_trapper(self,trapper):
         new_enemy_trap = TrapEnemy(self.__game, 20, "gray")
         new_enemy_trap.x = random.randint(trapper.x-5,trapper.x+5)
         new_enemy_trap.y = random.randint(trapper.y-5,trapper.y+5)
-        self.game.add_element(new_enemy_trap)
-        self.__game.after(math.ceil(10000/self.level)+200, lambda: self.create_trapper(trapper))
-        # self.__game.after(100, lambda: self.create_trapper(trapper))
-        # the comment part is actually hard mode
+        self.game.add_enemy(new_enemy_trap)
+        # scheduling this every 100 ms instead is actually hard mode
 
     def create_orbital(self, orbital):
         new_enemy_o = OrbittingEnemy(self.__game, 16, "crimson")
         new_enemy_o.x = orbital.x-50
         new_enemy_o.y = orbital.y-50
-        self.game.add_element(new_enemy_o)
-        self.__game.after(math.ceil(5000/self.level)+200, lambda: self.create_orbital(orbital)) 
+        self.game.add_enemy(new_enemy_o)
 
 class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
     """
@@ -909,6 +913,9 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.player: Player
         self.home: Home
         self.enemies: list[Enemy] = []
+        self.__free_items: dict[str, list[int]]
+        # the same enemies as self.enemies, grouped by their class
+        self.__enemies_by_kind: dict[type, list[Enemy]] = {}
         self.enemy_generator: EnemyGenerator
         super().__init__(parent)
 
@@ -926,23 +933,108 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.add_element(self.player)
         self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(e.x, e.y))
 
+        # pre-create hidden canvas items for enemies so that spawning one does
+        # not need a new canvas item; at most MAX_ENEMIES are in use at once
+        self.__free_items = {
+            shape: [self.__create_item(shape, state="hidden")
+                    for _ in range(MAX_ENEMIES//2)]
+            for shape in ("oval", "rectangle")
+        }
+
         self.enemy_generator = EnemyGenerator(self, level=self.level)
 
         self.player.x = 50
         self.player.y = self.screen_height//2
 
+    def __create_item(self, shape: str, **options) -> int:
+        if shape == "oval":
+            return self.canvas.create_oval(0, 0, 0, 0, **options)
+        return self.canvas.create_rectangle(0, 0, 0, 0, **options)
+
+    def acquire_item(self, shape: str, color: str, tags: tuple = ()) -> int:
+        """
+        Get a hidden canvas item of the given shape ("oval" or "rectangle")
+        filled with the given color and carrying the given tags, reusing a
+        pooled item when one is available. The item is shown by the first
+        render of its enemy, together with its coordinates.
+        """
+        free = self.__free_items[shape]
+        if not free:
+            return self.__create_item(shape, fill=color, tags=tags,
+                                      state="hidden")
+        item = free.pop()
+        self.canvas.itemconfigure(item, fill=color, tags=tags)
+        return item
+
+    def release_item(self, item: int) -> None:
+        """
+        Hide a canvas item obtained from acquire_item() and return it to the
+        pool for later reuse
+        """
+        self.canvas.itemconfigure(item, tags=(), state="hidden")
+        self.__free_items[self.canvas.type(item)].append(item)
+
     def add_enemy(self, enemy: Enemy) -> None:
         """
-        Add a new enemy into the current game
+        Add a new enemy into the current game. Once MAX_ENEMIES enemies are
+        alive, the oldest one, whatever its kind, is retired to make room.
         """
+        if len(self.enemies) >= MAX_ENEMIES:
+            self.remove_enemy(self.enemies[0])
         self.enemies.append(enemy)
-        self.add_element(enemy)
+        self.__enemies_by_kind.setdefault(type(enemy), []).append(enemy)
+        enemy.create()
+
+    def remove_enemy(self, enemy: Enemy) -> None:
+        """
+        Remove an enemy from the current game, returning its canvas item to
+        the pool and stopping the enemies it spawns. Must not be called while
+        the enemies are being stepped.
+        """
+        self.enemies.remove(enemy)
+        self.__enemies_by_kind[type(enemy)].remove(enemy)
+        enemy.delete()
+        self.enemy_generator.cancel(enemy)
+
+    def step_enemies(self) -> None:
+        """
+        Move and render all enemies by one frame, reading the player's
+        position only once
+        """
+        px = self.player.x
+        py = self.player.y
+        # step the enemies one kind at a time, so the methods are looked up
+        # once per kind rather than once per enemy
+        for kind, group in self.__enemies_by_kind.items():
+            step = kind.step
+            render = kind.render
+            for enemy in group:
+                step(enemy, px, py)
+                render(enemy)
+        # check collisions in a separate pass so the game ends at most once
+        # per frame; the player is hit when inside an enemy's bounding box
+        hit = any(abs(enemy.x - px) < enemy.size/2
+                  and abs(enemy.y - py) < enemy.size/2
+                  for enemy in self.enemies)
+        if hit:
+            self.game_over_lose()
+
+    def post_update(self) -> None:
+        # enemies are stepped after the player has moved in this frame
+        self.step_enemies()
+
+    def __hide_enemies(self) -> None:
+        # apply pending canvas changes first so that none of them can show an
+        # enemy again, then hide all enemies through their common tag
+        self.flush_render()
+        self.canvas.itemconfigure("enemy", state="hidden")
 
     def game_over_win(self) -> None:
         """
         Called when the player wins the game and stop the game
         """
         self.stop()
+        self.__hide_enemies()
         font = ("Arial", 36, "bold")
         self.canvas.create_text(self.screen_width/2,
                                 self.screen_height/2,
@@ -955,6 +1047,7 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         Called when the player loses the game and stop the game
         """
         self.stop()
+        self.__hide_enemies()
         font = ("Arial", 36, "bold")
         self.canvas.create_text(self.screen_width/2,
                                 self.screen_height/2,